@@ -242,6 +242,9 @@ class QTreeModel_Base(QAbstractItemModel):
 
         self.root = BranchNode('')
         self.headers = ['Name', 'Value']
+        # Root-to-leaf paths of keys and value, set by load(). The values are
+        # those at the last load(); refresh() does not update them when it
+        # only rebinds the tree, so read values from the nodes instead.
         self.paths = []
 
         self._start_timer()
@@ -284,13 +287,79 @@ class QTreeModel_Base(QAbstractItemModel):
             if self._view:
                 self._view.autoresize_columns()
 
-    def refresh(self):
+    def refresh(self) -> bool:
         """Force refresh.
 
-        Completely rebuild the model and tree.
+        If the nested keys of the data dict are unchanged, the existing tree
+        is pointed at the current data dict and only `dataChanged` is
+        emitted; this keeps the view's expanded rows and scroll position.
+        The values in `paths` are then left as of the last `load`.
+        Otherwise, completely rebuild the model and tree.
+
+        Returns:
+            bool: True if the model and tree were rebuilt
         """
+        if self.root.children and self._has_same_keys():
+            self._rebind_data(self.root, QModelIndex())
+            return False
+
         self.load()  # rebuild the tree
         self.modelReset.emit()
+        return True
+
+    def _has_same_keys(self) -> bool:
+        """Check if the tree was built from the same nested keys as the
+        current data dict.
+
+        Returns:
+            bool: True if the root-to-leaf key paths are unchanged
+        """
+        if (self.optionstype == 'component') and (not self.component):
+            return False
+        old_paths = [tuple(path[:-1]) for path in self.paths]
+        return old_paths == self.getKeyPaths(self.data_dict)
+
+    @staticmethod
+    def getKeyPaths(curdict: dict, curpath: tuple = ()) -> list:
+        """Recursively finds all root-to-leaf key paths of a dict, without the
+        values, in the same order as `getPaths`.
+
+        Args:
+            curdict (dict): The (nested) dict
+            curpath (tuple): Keys leading to curdict.  Defaults to ().
+
+        Returns:
+            list: List of tuples of keys
+        """
+        paths = []
+        for k, v in curdict.items():
+            if isinstance(v, dict):
+                paths += QTreeModel_Base.getKeyPaths(v, curpath + (k,))
+            else:
+                paths.append(curpath + (k,))
+        return paths
+
+    def _rebind_data(self, node: BranchNode, index: QModelIndex):
+        """Point a branch and its sub-branches at the current data dict, and
+        emit `dataChanged` for their children.
+
+        Args:
+            node (BranchNode): The branch
+            index (QModelIndex): Index of the branch
+        """
+        node._data = self.data_dict
+        if not node.children:
+            return
+
+        top_left = self.index(0, 0, index)
+        bottom_right = self.index(
+            len(node) - 1,
+            self.columnCount(index) - 1, index)
+        self.dataChanged.emit(top_left, bottom_right)
+
+        for row, (_, child) in enumerate(node.children):
+            if isinstance(child, BranchNode):
+                self._rebind_data(child, self.index(row, 0, index))
 
     def getPaths(self, curdict: dict, curpath: list):
         """Recursively finds and saves all root-to-leaf paths in model."""
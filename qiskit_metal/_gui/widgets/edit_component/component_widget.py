@@ -14,19 +14,27 @@
 """Main module that handles a component  inside the main window."""
 
 import ast
+import hashlib
 import inspect
+import json
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Union
+from string import Template
+from typing import TYPE_CHECKING, Dict, Tuple, Union
 
 import numpy as np
 import PySide2
 from PySide2 import QtCore, QtGui, QtWidgets
-from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
 from PySide2.QtGui import QFont, QColor
 from PySide2.QtWidgets import (QAbstractItemView, QApplication, QFileDialog,
                                QLabel, QMainWindow, QMessageBox, QTabWidget)
 
-from .... import logger
+from .... import config, logger
 from ...component_widget_ui import Ui_ComponentWidget
 from .tree_model_options import QTreeModel_Options
 
@@ -37,17 +45,459 @@ if TYPE_CHECKING:
     from ....qlibrary import QComponent
     from ....designs import QDesign
 
-try:  # For source doc
+
+@lru_cache(maxsize=None)
+def _get_pygments() -> Union[tuple, None]:
+    """Import pygments and build the python lexer and style on first use.
+
+    Importing pygments and setting up the lexer is expensive, so it is only
+    done once the Source tab is first displayed.
+
+    Returns:
+        Union[tuple, None]: The python lexer and the pygments style class;
+        None if pygments could not be loaded
+    """
+    try:  # For source doc
+        from pygments.lexers import get_lexer_by_name
+        from pygments.styles import get_style_by_name
+    except ImportError as e:
+        logger.error(
+            f'Error: Could not load python package \'pygments\'; Error: {e}')
+        return None
+    # No stripall: token offsets must line up with the lines of the document
+    return get_lexer_by_name("python"), get_style_by_name('default')
+
+
+# Number of displayed sources kept in memory by the component widget
+_SRC_CACHE_SIZE = 64
+
+# Version of the on-disk span cache format; bump when `_tokenize_python`
+# changes, so stale spans are not served
+_SOURCE_CACHE_VERSION = 2
+
+
+def _read_source(path: str) -> str:
+    """Read a source file with a single buffered binary read and decode it
+    once.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: The decoded text, with Windows line endings normalized
+    """
+    with open(path, 'rb', buffering=1 << 17) as f:
+        raw = f.read()
+    return raw.decode('utf-8', errors='replace').replace('\r\n', '\n')
+
+
+def _python_file_spans(path: str, mtime: float, text: str) -> dict:
+    """Get the token spans of a python source file for
+    `PygmentsHighlighter`, from the on-disk cache or by tokenizing text.
+
+    Args:
+        path (str): Path to the python file
+        mtime (float): Modification time of the file
+        text (str): Source text of the file, as read by `_read_source`
+
+    Returns:
+        dict: Maps each line number to a tuple of
+        ``(column, length, token type)`` spans
+    """
+    spans = _load_cached_spans(path, mtime)
+    if spans is None:
+        spans = _tokenize_python(text)
+        _store_cached_spans(path, mtime, spans)
+    return spans
+
+
+def _source_cache_file(path: str, mtime: float) -> Path:
+    """Get the on-disk cache file of the token spans of a source file.
+
+    The cache directory is set by ``config.GUI_CONFIG.source_cache.path``.
+    The file name includes `_SOURCE_CACHE_VERSION` and the pygments version,
+    so spans written by another tokenizer or lexer are never read back.
+
+    Args:
+        path (str): Path to the python file
+        mtime (float): Modification time of the file
+
+    Returns:
+        Path: The cache file
+    """
     import pygments
-    from pygments import highlight
-    from pygments.formatters import HtmlFormatter
-    from pygments.lexers import get_lexer_by_name
-except ImportError as e:
-    logger.error(
-        f'Error: Could not load python package \'pygments\'; Error: {e}')
-    highlight = None
-    HtmlFormatter = None
-    get_lexer_by_name = None
+    cache_dir = Path(config.GUI_CONFIG.source_cache.path).expanduser()
+    digest = hashlib.sha1(path.encode('utf-8')).hexdigest()
+    return cache_dir / (f'{digest}-{mtime!r}-v{_SOURCE_CACHE_VERSION}'
+                        f'-pygments{pygments.__version__}.spans.json')
+
+
+def _load_cached_spans(path: str, mtime: float) -> Union[dict, None]:
+    """Load the token spans of a source file from the on-disk cache.
+
+    Args:
+        path (str): Path to the python file
+        mtime (float): Modification time of the file
+
+    Returns:
+        Union[dict, None]: The spans, as returned by `_tokenize_python`;
+        None if not cached
+    """
+    from pygments.token import string_to_tokentype
+
+    cache_file = _source_cache_file(path, mtime)
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        spans = {
+            int(line):
+                tuple(
+                    (int(column), int(length), string_to_tokentype(str(ttype)))
+                    for column, length, ttype in line_spans)
+            for line, line_spans in stored
+        }
+        os.utime(cache_file)  # mark as recently used, for eviction
+    except (OSError, ValueError, TypeError):
+        return None
+    return spans
+
+
+def _store_cached_spans(path: str, mtime: float, spans: dict):
+    """Atomically write the token spans of a source file to the on-disk
+    cache, then evict the least recently used cache files over the
+    ``config.GUI_CONFIG.source_cache.max_size`` budget.
+
+    Args:
+        path (str): Path to the python file
+        mtime (float): Modification time of the file
+        spans (dict): The spans, as returned by `_tokenize_python`
+    """
+    cache_file = _source_cache_file(path, mtime)
+    # Plain json: line numbers, columns, lengths and token type names
+    stored = [[
+        line,
+        [[column, length, str(ttype)] for column, length, ttype in line_spans]
+    ] for line, line_spans in spans.items()]
+    tmp_name = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w',
+                                         encoding='utf-8',
+                                         dir=cache_file.parent,
+                                         suffix='.spans.tmp',
+                                         delete=False) as f:
+            tmp_name = f.name
+            json.dump(stored, f, separators=(',', ':'))
+        os.replace(tmp_name, cache_file)
+        tmp_name = None
+        _evict_source_cache(cache_file.parent,
+                            config.GUI_CONFIG.source_cache.max_size)
+    except OSError as e:
+        logger.debug(f'Could not write source cache {cache_file}: {e}')
+    finally:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def _evict_source_cache(cache_dir: Path, max_size: int):
+    """Remove the least recently used cache files until the directory is
+    within budget.
+
+    Only files named like `_source_cache_file` are considered.
+
+    Args:
+        cache_dir (Path): The cache directory
+        max_size (int): Budget, in bytes
+    """
+    entries = []
+    for cache_file in cache_dir.glob('*.spans.json'):
+        try:
+            stat = cache_file.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, cache_file))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, cache_file in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_size:
+            break
+        try:
+            cache_file.unlink()
+            total -= size
+        except OSError:
+            pass
+
+
+def _tokenize_python(text: str) -> dict:
+    """Split the pygments python tokens of text into per-line spans.
+
+    Args:
+        text (str): Python source
+
+    Columns and lengths are in UTF-16 code units, as are QTextBlock
+    positions.
+
+    Returns:
+        dict: Maps each line number to a tuple of
+        ``(column, length, token type)`` spans
+    """
+    lexer = _get_pygments()[0]
+    spans = {}
+    line, column = 0, 0
+    for _, ttype, value in lexer.get_tokens_unprocessed(text):
+        # Multi-line tokens, such as docstrings, are split across blocks
+        for i, piece in enumerate(value.split('\n')):
+            if i:
+                line += 1
+                column = 0
+            length = len(piece.encode('utf-16-le')) // 2
+            # Whitespace is not highlighted, but still moves the column
+            if piece and not piece.isspace():
+                spans.setdefault(line, []).append((column, length, ttype))
+            column += length
+    return {line: tuple(line_spans) for line, line_spans in spans.items()}
+
+
+class _HighlightSignals(QtCore.QObject):
+    """Signals of `_HighlightJob`; a QRunnable is not a QObject."""
+
+    # path, mtime, text; once the file is read
+    loaded = QtCore.Signal(str, float, str)
+    # path, mtime, (text, spans) or None on error
+    finished = QtCore.Signal(str, float, object)
+
+
+class _HighlightJob(QtCore.QRunnable):
+    """Read and tokenize a python source file in a `QThreadPool` worker
+    thread.
+
+    This class extends the `QRunnable` class.
+    """
+
+    def __init__(self, path: str, mtime: float):
+        """
+        Args:
+            path (str): Path to the python file
+            mtime (float): Modification time of the file
+        """
+        super().__init__()
+        self.path = path
+        self.mtime = mtime
+        self.signals = _HighlightSignals()
+
+    def run(self):
+        """Read and tokenize the file, emitting the text and then the result
+        back to the GUI thread."""
+        try:
+            text = _read_source(self.path)
+        except OSError as e:
+            logger.error(f'Could not read source file {self.path}: {e}')
+            self.signals.finished.emit(self.path, self.mtime, None)
+            return
+        self.signals.loaded.emit(self.path, self.mtime, text)
+        spans = _python_file_spans(self.path, self.mtime, text)
+        self.signals.finished.emit(self.path, self.mtime, (text, spans))
+
+
+class PygmentsHighlighter(QtGui.QSyntaxHighlighter):
+    """Highlights a plain text document from pre-computed pygments token
+    spans, one block (line) at a time.
+
+    This class extends the `QSyntaxHighlighter` class.
+    """
+
+    def __init__(self, document: QtGui.QTextDocument, style=None):
+        """
+        Args:
+            document (QtGui.QTextDocument): Document to highlight
+            style (pygments.style.Style): Pygments style.  Defaults to None,
+                for the default style of `_get_pygments`.
+        """
+        super().__init__(document)
+        self.style = style or _get_pygments()[1]
+        self.spans = {}  # type: Dict[int, tuple]
+        self._formats = {}  # type: Dict[object, QtGui.QTextCharFormat]
+
+    def set_spans(self, spans: dict):
+        """Set the token spans and rehighlight the document.
+
+        Args:
+            spans (dict): Maps each line number to a tuple of
+                ``(column, length, token type)`` spans
+        """
+        self.spans = spans
+        self.rehighlight()
+
+    def _format(self, ttype) -> QtGui.QTextCharFormat:
+        """Get the (cached) character format of a token type.
+
+        Args:
+            ttype (pygments.token._TokenType): Token type
+
+        Returns:
+            QtGui.QTextCharFormat: The format
+        """
+        fmt = self._formats.get(ttype)
+        if fmt is None:
+            token_style = self.style.style_for_token(ttype)
+            fmt = QtGui.QTextCharFormat()
+            if token_style['color']:
+                fmt.setForeground(QColor('#' + token_style['color']))
+            if token_style['bgcolor']:
+                fmt.setBackground(QColor('#' + token_style['bgcolor']))
+            if token_style['bold']:
+                fmt.setFontWeight(QFont.Bold)
+            if token_style['italic']:
+                fmt.setFontItalic(True)
+            if token_style['underline']:
+                fmt.setFontUnderline(True)
+            self._formats[ttype] = fmt
+        return fmt
+
+    def highlightBlock(self, text: str):
+        """Apply the token formats of the current block.
+
+        Called by Qt, on a per-block basis, whenever the block changes.
+
+        Args:
+            text (str): Text of the block
+        """
+        line = self.currentBlock().blockNumber()
+        for column, length, ttype in self.spans.get(line, ()):
+            self.setFormat(column, length, self._format(ttype))
+
+
+class LineNumberArea(QtWidgets.QWidget):
+    """Line number gutter drawn on the left of a `QTextEdit`.
+
+    This class extends the `QWidget` class.
+    """
+
+    def __init__(self, editor: QtWidgets.QTextEdit):
+        """
+        Args:
+            editor (QtWidgets.QTextEdit): Text edit to number.  Its document
+                should already be set.
+        """
+        super().__init__(editor)
+        self.editor = editor
+        self.setFont(editor.document().defaultFont())
+
+        editor.document().blockCountChanged.connect(self.update_width)
+        editor.document().contentsChanged.connect(self.update)
+        editor.verticalScrollBar().valueChanged.connect(self.update)
+        editor.installEventFilter(self)
+        self.update_width()
+
+    def gutter_width(self) -> int:
+        """Get the width needed for the largest line number.
+
+        Returns:
+            int: Width in pixels
+        """
+        digits = len(str(max(1, self.editor.document().blockCount())))
+        return 8 + self.fontMetrics().horizontalAdvance('9') * digits
+
+    def update_width(self, *args):
+        """Reserve room for the gutter to the left of the editor viewport."""
+        self.editor.setViewportMargins(self.gutter_width(), 0, 0, 0)
+        self._update_geometry()
+
+    def _update_geometry(self):
+        """Fit the gutter to the left edge of the editor contents."""
+        rect = self.editor.contentsRect()
+        self.setGeometry(rect.left(), rect.top(), self.gutter_width(),
+                         rect.height())
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        """Follow the editor when it is resized.
+
+        Args:
+            obj (QtCore.QObject): The watched object
+            event (QtCore.QEvent): The event
+
+        Returns:
+            bool: False, so the event is always passed on
+        """
+        if obj is self.editor and event.type() == QtCore.QEvent.Resize:
+            self._update_geometry()
+        return False
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        """Paint the numbers of the visible blocks.
+
+        Args:
+            event (QtGui.QPaintEvent): The paint event
+        """
+        painter = QtGui.QPainter(self)
+        painter.fillRect(event.rect(), QColor('#EEEEEE'))
+        painter.setPen(QColor('#808080'))
+
+        layout = self.editor.document().documentLayout()
+        offset = self.editor.verticalScrollBar().value()
+        line_height = self.fontMetrics().height()
+        width = self.width() - 4
+
+        # Start at the first visible block
+        block = self.editor.cursorForPosition(QtCore.QPoint(0, 0)).block()
+        while block.isValid():
+            top = layout.blockBoundingRect(block).top() - offset
+            if top > event.rect().bottom():
+                break
+            painter.drawText(0, int(top), width, line_height, Qt.AlignRight,
+                             str(block.blockNumber() + 1))
+            block = block.next()
+        painter.end()
+
+
+def _fast_getfile(cls: type) -> str:
+    """Get the file a class is defined in from its module in ``sys.modules``,
+    falling back on ``inspect.getfile``.
+
+    Args:
+        cls (type): The class
+
+    Returns:
+        str: Path to the file where the class is defined
+    """
+    module = sys.modules.get(cls.__module__)
+    return getattr(module, '__file__', None) or inspect.getfile(cls)
+
+
+def _cached_getfile(cls: type) -> str:
+    """Get the file a class is defined in, cached on the class itself.
+
+    Args:
+        cls (type): The class
+
+    Returns:
+        str: Path to the file where the class is defined
+    """
+    # Look in the class' own __dict__; a subclass may live in another file
+    filepath = cls.__dict__.get('_qm_srcpath')
+    if filepath is None:
+        filepath = _fast_getfile(cls)
+        cls._qm_srcpath = filepath
+    return filepath
+
+
+@lru_cache(maxsize=128)
+def _help_html_for_class(cls: type) -> Tuple[str, str, str]:
+    """Memoized per-class parts of the help html.
+
+    Args:
+        cls (type): The component class
+
+    Returns:
+        Tuple[str, str, str]: The file path of the class, and the class and
+        init docstrings formatted by `format_docstr`
+    """
+    return (_cached_getfile(cls), format_docstr(inspect.getdoc(cls)),
+            format_docstr(inspect.getdoc(cls.__init__)))
+
 
 # TODO: move to config
 textHelp_css_style = """
@@ -92,6 +542,30 @@ body {
 }*/
 """
 
+# Help tab html, filled in by ComponentWidget._set_help
+_HELP_TMPL = Template('''<body>
+        <div class="h1">Summary:</div>
+        <table class="table ComponentHeader">
+            <tbody>
+                <tr> <th>Name</th> <td>$name</td></tr>
+                <tr> <th>Class</th><td>$cls</td></tr>
+                <tr> <th>Module</th><td>$mod</td></tr>
+                <tr> <th>Path </th> <td style="text-color=#BBBBBB;"> $path</td></tr>
+            </tbody>
+        </table>
+            <div class="h1">Class docstring:</div>
+            $doc_class
+            <div class="h1">Init docstring:</div>
+            $doc_init
+        </body>''')
+
+_DOC_PRE = """
+<pre style="background-color: #EBECE4;">
+<code class="DocString">"""
+_DOC_POST = """</code>
+</pre>
+    """
+
 
 def format_docstr(doc: Union[str, None]) -> str:
     """Format a docstring.
@@ -105,13 +579,7 @@ def format_docstr(doc: Union[str, None]) -> str:
 
     if doc is None:
         return ''
-    doc = doc.strip()
-    text = f"""
-<pre style="background-color: #EBECE4;">
-<code class="DocString">{doc}</code>
-</pre>
-    """
-    return text
+    return _DOC_PRE + doc.strip() + _DOC_POST
 
 
 def create_QTextDocument(doc: QtWidgets.QTextEdit) -> QtGui.QTextDocument:
@@ -177,6 +645,8 @@ class ComponentWidget(QTabWidget):
         self.ui.setupUi(self)
 
         self.component_name = None  # type: str
+        # set_component calls are coalesced and applied on the next event loop
+        self._pending = False
 
         # Parameter model and table view
         self.model = QTreeModel_Options(self, gui, self.ui.treeView)
@@ -185,17 +655,32 @@ class ComponentWidget(QTabWidget):
         self.ui.treeView.setHorizontalScrollMode(
             QAbstractItemView.ScrollPerPixel)
 
+        self.src_doc = create_QTextDocument(self.ui.textSource)
+        self.src_line_numbers = LineNumberArea(self.ui.textSource)
         self.ui.textSource.setStyleSheet("""
             color: #000000;
             """)
-        self.src_doc = create_QTextDocument(self.ui.textSource)
-        self._html_css_lex = None  # type: pygments.formatters.html.HtmlFormatter
-        self.src_widgets = []  # type: List[QtWidgets.QWidget]
+        # Created on first use of the Source tab, see `_get_src_highlighter`
+        self.src_highlighter = None  # type: PygmentsHighlighter
+        # (path, mtime) of the source to display, and of the source whose
+        # text is in src_doc
+        self._src_key = None  # type: Tuple[str, float]
+        self._src_shown = None  # type: Tuple[str, float]
+        # Running background jobs, by (path, mtime); references are kept
+        # while they run
+        self._highlight_jobs = {}  # type: Dict[tuple, _HighlightJob]
+        # (text, spans) of the sources tokenized so far, by (path, mtime),
+        # least recently used first
+        self._src_cache = OrderedDict()
 
         # Help stylesheet
         document = self.ui.textHelp.document()
         document.setDefaultStyleSheet(textHelp_css_style)
 
+        # The help and source tabs are only populated when shown
+        self._dirty = {'help': True, 'source': True}
+        self.currentChanged.connect(self._populate_current_tab)
+
     @property
     def design(self):
         """Returns the design."""
@@ -224,19 +709,30 @@ class ComponentWidget(QTabWidget):
     def set_component(self, name: str):
         """Main interface to set the component (by name)
 
+        The tabs are updated on the next pass of the event loop, so that rapid
+        successive calls (e.g., scrolling through the components list) only
+        do the work for the last component.
+
         Args:
             name (str): Set the component name, if None then clears
         """
         self.component_name = name
 
-        if name is None:
+        if not self._pending:
+            self._pending = True
+            QTimer.singleShot(0, self._apply_pending)
+
+    def _apply_pending(self):
+        """Update the widget for the last component set by `set_component`."""
+        self._pending = False
+
+        component = self.component
+        if component is None:
             # TODO: handle case when name is none: just clear all
             # TODO: handle case where the component is made in jupyter notebook
             self.force_refresh()
             return
 
-        component = self.component
-
         # Labels
         # ) from {component.__class__.__module__}
         label_text = f"{component.name}   :   {component.__class__.__name__}   :   {component.__class__.__module__}"
@@ -245,15 +741,47 @@ class ComponentWidget(QTabWidget):
         self.setWindowTitle(label_text)
         self.parent().setWindowTitle(label_text)
 
-        self._set_source()
-        self._set_help()
+        self._dirty['help'] = True
+        self._dirty['source'] = True
+        self._populate_current_tab()
 
-        self.force_refresh()
-        self.ui.treeView.autoresize_columns()  # resize columns
+        # Only resize columns when the rows were rebuilt
+        if self.force_refresh():
+            self.ui.treeView.autoresize_columns()  # resize columns
 
-    def force_refresh(self):
-        """Force refresh."""
-        self.model.refresh()
+    def force_refresh(self) -> bool:
+        """Force refresh.
+
+        Returns:
+            bool: True if the options model was rebuilt, rather than updated
+        """
+        return self.model.refresh()
+
+    def showEvent(self, event: QtGui.QShowEvent):
+        """Populate the current tab, if needed, when the widget is shown.
+
+        Args:
+            event (QtGui.QShowEvent): The show event
+        """
+        super().showEvent(event)
+        self._populate_current_tab()
+
+    def _populate_current_tab(self, *args):
+        """Set the help or source of the current tab if it is out of date.
+
+        Nothing is done while the widget is hidden; the tab is populated
+        when it is next shown.
+        """
+        if not self.isVisible() or self.component is None:
+            return
+
+        current = self.currentWidget()
+        if current is self.ui.tabHelp and self._dirty['help']:
+            self._set_help()
+            self._dirty['help'] = False
+        elif current is self.ui.tabSource and self._dirty['source']:
+            self._set_source()
+            self._dirty['source'] = False
 
     def _set_help(self):
         """Called when we need to set a new help."""
@@ -268,36 +796,19 @@ class ComponentWidget(QTabWidget):
         if component is None:
             return
 
-        filepath = self.qcomponent_file_path
-        doc_class = format_docstr(inspect.getdoc(component))
-        doc_init = format_docstr(inspect.getdoc(component.__init__))
-
-        text = "<body>"
-        text += f'''
-        <div class="h1">Summary:</div>
-        <table class="table ComponentHeader">
-            <tbody>
-                <tr> <th>Name</th> <td>{component.name}</td></tr>
-                <tr> <th>Class</th><td>{component.__class__.__name__}</td></tr>
-                <tr> <th>Module</th><td>{component.__class__.__module__}</td></tr>
-                <tr> <th>Path </th> <td style="text-color=#BBBBBB;"> {filepath}</td></tr>
-            </tbody>
-        </table>
-        '''
+        filepath, doc_class, doc_init = _help_html_for_class(
+            component.__class__)
 
         # get image
         # if image_path:
-        #     text += f'''
         #     <img class="ComponentImage" src="{image_path}"></img>
-        #     '''
 
-        text += f'''
-            <div class="h1">Class docstring:</div>
-            {doc_class}
-            <div class="h1">Init docstring:</div>
-            {doc_init}
-        '''
-        text += "</body>"
+        text = _HELP_TMPL.substitute(name=component.name,
+                                     cls=component.__class__.__name__,
+                                     mod=component.__class__.__module__,
+                                     path=filepath,
+                                     doc_class=doc_class,
+                                     doc_init=doc_init)
 
         self.ui.textHelp.setHtml(text)
 
@@ -305,8 +816,7 @@ class ComponentWidget(QTabWidget):
     def qcomponent_file_path(self):
         """Get file path to qcomponent."""
         component = self.component
-        module = inspect.getmodule(component)
-        filepath = inspect.getfile(module)
+        filepath = _cached_getfile(component.__class__)
         # TypeError
         return filepath
 
@@ -318,36 +828,109 @@ class ComponentWidget(QTabWidget):
 
         document = self.src_doc
 
-        text = Path(filepath).read_text()
-
-        if not (highlight is None):
-            lexer = get_lexer_by_name("python", stripall=True)
-            formatter = HtmlFormatter(linenos='inline')
-            self._html_css_lex = formatter.get_style_defs('.highlight')
-
-            document.setDefaultStyleSheet(self._html_css_lex)
-            text_html = highlight(text, lexer, formatter)
-            document.setHtml(text_html)
-
-            # Grab the highlight colour from pygment's HTML and use it as
-            # the background colour for the textSource widget
-            # Also set the text colour to black
-            wiget_background_html = '.highlight { background: '
-            newstr = self._html_css_lex[self._html_css_lex.
-                                        index(wiget_background_html) +
-                                        len(wiget_background_html):]
-            bg_color_1 = newstr[:newstr.find(';')]
-            bg_color_2 = newstr[:newstr.find('}')]
-            bg_color = bg_color_2 if len(bg_color_2) < len(
-                bg_color_1) else bg_color_1
-            self.ui.textSource.setStyleSheet(f"""
-            background-color: {bg_color}; 
-            color: #000000;
-            """)
+        mtime = os.path.getmtime(filepath)
+        self._src_key = (filepath, mtime)
+
+        if self._get_src_highlighter() is None:
+            document.setPlainText(_read_source(filepath))
+            self._src_shown = self._src_key
+            self._move_source_to_start()
+
+        elif self._src_key in self._src_cache:
+            self._src_cache.move_to_end(self._src_key)
+            self._show_source(*self._src_cache[self._src_key])
 
         else:
-            document.setPlainText(text)
+            # Read and tokenize in the background, so that the GUI stays
+            # responsive; the plain text is shown once read, and highlighted
+            # once tokenized
+            self.src_highlighter.spans = {}
+            document.clear()
+            self._src_shown = None
+
+            if self._src_key not in self._highlight_jobs:
+                job = _HighlightJob(filepath, mtime)
+                job.signals.loaded.connect(self._on_source_loaded)
+                job.signals.finished.connect(self._on_highlight_finished)
+                self._highlight_jobs[self._src_key] = job
+                QtCore.QThreadPool.globalInstance().start(job)
+
+    def _show_source(self, text: str, spans: dict):
+        """Display the current source.
 
+        Args:
+            text (str): Source text
+            spans (dict): Token spans of the text, as returned by
+                `_tokenize_python`
+        """
+        # Set the spans first; setPlainText then synchronously
+        # rehighlights every block of the new text with them
+        self.src_highlighter.spans = spans
+        self.src_doc.setPlainText(text)
+        self._src_shown = self._src_key
+        self._move_source_to_start()
+
+    def _move_source_to_start(self):
+        """Scroll the source view back to the top."""
         textEdit = self.ui.textSource
         textEdit.moveCursor(QtGui.QTextCursor.Start)
         textEdit.ensureCursorVisible()
+
+    def _get_src_highlighter(self) -> Union[PygmentsHighlighter, None]:
+        """Get the source highlighter, creating it on first call.
+
+        Returns:
+            Union[PygmentsHighlighter, None]: The highlighter; None if
+            pygments is not available
+        """
+        if self.src_highlighter is None and _get_pygments() is not None:
+            self.src_highlighter = PygmentsHighlighter(self.src_doc)
+            # Use the pygments style background colour for the textSource
+            # widget. Also set the text colour to black. Set once, since Qt
+            # re-parses the style sheet every time it is set.
+            bg_color = self.src_highlighter.style.background_color
+            self.ui.textSource.setStyleSheet(f"""
+            background-color: {bg_color};
+            color: #000000;
+            """)
+        return self.src_highlighter
+
+    def _on_source_loaded(self, path: str, mtime: float, text: str):
+        """Show the plain text read by a background `_HighlightJob`.
+
+        Args:
+            path (str): Path to the python file
+            mtime (float): Modification time of the file
+            text (str): Source text of the file
+        """
+        if self._src_key == (path, mtime):
+            self._show_source(text, {})
+
+    def _on_highlight_finished(self, path: str, mtime: float, result: tuple):
+        """Cache and apply the spans of a background `_HighlightJob`.
+
+        The spans are not applied if a different source has been displayed
+        since the job was started.
+
+        Args:
+            path (str): Path to the python file
+            mtime (float): Modification time of the file
+            result (tuple): The text and spans of the file; None if the
+                file could not be read
+        """
+        key = (path, mtime)
+        self._highlight_jobs.pop(key, None)
+        if result is None:
+            return
+
+        self._src_cache[key] = result
+        while len(self._src_cache) > _SRC_CACHE_SIZE:
+            self._src_cache.popitem(last=False)
+
+        if self._src_key != key:
+            return
+        if self._src_shown == key:
+            # The same text is already displayed; only rehighlight
+            self.src_highlighter.set_spans(result[1])
+        else:
+            self._show_source(*result)
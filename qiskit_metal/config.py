@@ -76,6 +76,10 @@ GUI_CONFIG = Dict(
     main_window=Dict(
         title='Qiskit Metal — The Quantum Builder',
         auto_size=False,  # Autosize on creation of window
+    ),
+    source_cache=Dict(
+        path='~/.qiskit_metal/pygments_cache',
+        max_size=64 * 1024**2,  # bytes; least recently used files evicted
     ))
 """
 GUI_CONFIG
@@ -109,6 +113,13 @@ Logger settings
 
 ---------------------------
 Main window defaults
+
+
+**source_cache**
+
+---------------------------
+On-disk cache of the highlighted QComponent source shown in the component
+widget; its directory and size budget
 """
 
 log = Dict(format='%(asctime)s %(levelname)s [%(funcName)s]: %(message)s',
@@ -19,9 +19,13 @@
 Test a planar design and launching the GUI.
 """
 
+import functools
+import types
 import unittest
 from qiskit_metal._gui.widgets.bases.dict_tree_base import BranchNode
 from qiskit_metal._gui.widgets.bases.dict_tree_base import LeafNode
+from qiskit_metal._gui.widgets.bases.dict_tree_base import QTreeModel_Base
+from qiskit_metal._gui.widgets.edit_component.component_widget import _tokenize_python
 
 
 class TestGUIBasic(unittest.TestCase):
@@ -51,6 +55,75 @@ class TestGUIBasic(unittest.TestCase):
             message = "LeafNode instantiation failed"
             self.fail(message)
 
+    def _key_paths_of_get_paths(self, dic: dict) -> list:
+        """Run QTreeModel_Base.getPaths, without a Qt model, and strip the
+        values from the paths."""
+        stub = types.SimpleNamespace(paths=[])
+        stub.getPaths = functools.partial(QTreeModel_Base.getPaths, stub)
+        stub.getPaths(dic, [])
+        return [tuple(path[:-1]) for path in stub.paths]
+
+    def test_get_key_paths_nested(self):
+        """Test getKeyPaths of a nested dict matches getPaths order."""
+        dic = {'a': 1, 'b': {'c': 2, 'd': {'e': 3}}, 'f': 4}
+        key_paths = QTreeModel_Base.getKeyPaths(dic)
+        self.assertEqual(key_paths, [('a',), ('b', 'c'), ('b', 'd', 'e'),
+                                     ('f',)])
+        self.assertEqual(key_paths, self._key_paths_of_get_paths(dic))
+
+    def test_get_key_paths_empty_sub_dict(self):
+        """Test getKeyPaths skips empty sub-dicts, like getPaths."""
+        dic = {'a': {}, 'b': 1, 'c': {'d': {}, 'e': 2}}
+        key_paths = QTreeModel_Base.getKeyPaths(dic)
+        self.assertEqual(key_paths, [('b',), ('c', 'e')])
+        self.assertEqual(key_paths, self._key_paths_of_get_paths(dic))
+
+    def test_get_key_paths_leaf_to_dict(self):
+        """Test getKeyPaths changes when a key switches between a leaf and
+        a dict."""
+        leaf = {'a': 1, 'b': 2}
+        branch = {'a': {'x': 1}, 'b': 2}
+        self.assertEqual(QTreeModel_Base.getKeyPaths(branch),
+                         self._key_paths_of_get_paths(branch))
+        self.assertNotEqual(QTreeModel_Base.getKeyPaths(leaf),
+                            QTreeModel_Base.getKeyPaths(branch))
+
+    def test_tokenize_python_columns(self):
+        """Test _tokenize_python spans line up with indented source."""
+        text = "class A:\n    def foo(self):\n        return x + 1\n"
+        lines = text.split('\n')
+        spans = _tokenize_python(text)
+
+        found = [(line, lines[line][column:column + length], str(ttype))
+                 for line, line_spans in sorted(spans.items())
+                 for column, length, ttype in line_spans]
+        self.assertIn((0, 'class', 'Token.Keyword'), found)
+        self.assertIn((1, 'def', 'Token.Keyword'), found)
+        self.assertIn((1, 'foo', 'Token.Name.Function'), found)
+        self.assertIn((2, 'return', 'Token.Keyword'), found)
+        self.assertIn((2, '1', 'Token.Literal.Number.Integer'), found)
+        # Whitespace is skipped
+        for _, piece, _ in found:
+            self.assertFalse(piece.isspace())
+
+    def test_tokenize_python_multiline_and_utf16(self):
+        """Test _tokenize_python splits docstrings across lines and counts
+        columns in UTF-16 code units."""
+        text = 'x = "\U0001F600"; y = 1\n"""a\nb"""\n'
+        spans = _tokenize_python(text)
+
+        # The emoji is two UTF-16 code units, which shifts 'y' to column 10
+        names = [(column, length)
+                 for column, length, ttype in spans[0]
+                 if str(ttype) == 'Token.Name']
+        self.assertEqual(names, [(0, 1), (10, 1)])
+        self.assertIn((5, 2),
+                      [(column, length) for column, length, _ in spans[0]])
+        self.assertEqual([(c, n, str(t)) for c, n, t in spans[1]],
+                         [(0, 4, 'Token.Literal.String.Doc')])
+        self.assertEqual([(c, n, str(t)) for c, n, t in spans[2]],
+                         [(0, 4, 'Token.Literal.String.Doc')])
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)